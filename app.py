@@ -1,33 +1,243 @@
 from flask import Flask, render_template, request, send_file, flash, redirect, url_for, Response, session
+from flask.wrappers import Request
 import os
-import uuid
+import re
+import secrets
 from werkzeug.utils import secure_filename
 import tempfile
-from pathlib import Path
-import glob
 import time
 import shutil
+import subprocess
+import hashlib
+import json
+import threading
+import heapq
+import operator
+import atexit
 import random
-from data_shifting import fix_data_shifting
+from concurrent.futures import ThreadPoolExecutor
+
+# Optional: batch unlinks through io_uring on Linux 5.11+ (pip install liburing)
+try:
+    import liburing
+except ImportError:
+    liburing = None
+
+# Optional: lock the sweep marker so only one worker claims a sweep (POSIX only)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+class UploadRequest(Request):
+    """
+    Request that spools uploaded files straight into the upload folder.
+    
+    Werkzeug's default spools uploads to the system temp directory (or RAM for
+    small files), so saving an upload copies every byte a second time. Spooling
+    next to the destination lets save_upload() move the file into place with a
+    rename instead of a copy.
+    """
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        spool = tempfile.NamedTemporaryFile('wb+', dir=BASE_UPLOAD_FOLDER, prefix='.upload-', delete=False)
+        self.__dict__.setdefault('_spooled_paths', []).append(spool.name)
+        return spool
+    
+    def close(self):
+        super().close()
+        # Remove any spooled upload that was not moved into a user folder
+        for spool_path in self.__dict__.get('_spooled_paths', ()):
+            try:
+                os.remove(spool_path)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"Error removing spooled upload {spool_path}: {e}")
 
 app = Flask(__name__)
 app.secret_key = 'data_shifting_secret_key'
+app.request_class = UploadRequest
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_FILE_SIZE', 100 * 1024 * 1024))  # Default 100MB
+
+# Analyze uploads in-process by default: each web worker would otherwise start
+# its own pool of data_shifting worker processes (read when it is imported)
+os.environ.setdefault('PARALLEL_WORKERS', '1')
 
 # Configure base folders
 BASE_UPLOAD_FOLDER = 'uploads'
 BASE_OUTPUT_FOLDER = 'outputs'
 
 # Create base directories if they don't exist
-if not os.path.exists(BASE_UPLOAD_FOLDER):
-    os.makedirs(BASE_UPLOAD_FOLDER)
-if not os.path.exists(BASE_OUTPUT_FOLDER):
-    os.makedirs(BASE_OUTPUT_FOLDER)
+os.makedirs(BASE_UPLOAD_FOLDER, exist_ok=True)
+os.makedirs(BASE_OUTPUT_FOLDER, exist_ok=True)
+
+# User folders live under base/<first USER_SHARD_WIDTH chars of the id>/<id>
+USER_SHARD_WIDTH = 2
+
+# Characters of the ids from secrets.token_urlsafe (and the older uuid4 ids)
+USER_ID_PATTERN = re.compile(r'[A-Za-z0-9_-]+')
+
+# Background executor for folder maintenance so deletes never block a response
+CLEANUP_EXEC = ThreadPoolExecutor(max_workers=2, thread_name_prefix='cleanup')
+atexit.register(CLEANUP_EXEC.shutdown)
+
+# Above this many stale files, delete them with a single `rm` process instead of
+# one os.remove call per file
+BATCH_DELETE_THRESHOLD = 32
+
+# Submission queue depth used when batching unlinks through io_uring
+IO_URING_QUEUE_DEPTH = 128
+
+# Seconds between background sweeps for inactive user folders. Every worker
+# checks the shared marker's modification time every INACTIVE_SWEEP_CHECK_INTERVAL
+# seconds, so sweeps keep happening however often workers are recycled.
+INACTIVE_SWEEP_INTERVAL = 3600
+INACTIVE_SWEEP_CHECK_INTERVAL = 60
+SWEEP_MARKER_PATH = os.path.join(BASE_UPLOAD_FOLDER, '.last_sweep')
+
+# Last-seen index used to find inactive users. Folder access times are not
+# reliable on noatime mounts, so get_user_folders records activity instead.
+ACTIVITY_INDEX_PATH = os.path.join(BASE_UPLOAD_FOLDER, '.last_seen.json')
+ACTIVITY_INDEX_LOCK_PATH = ACTIVITY_INDEX_PATH + '.lock'
+ACTIVITY_FLUSH_EVERY = 50  # Persist the index after this many recorded visits
+ACTIVITY_FLUSH_INTERVAL = 60  # ...or once a visit is recorded this many seconds after the last flush
+_LAST_SEEN = {}
+_LAST_SEEN_LOCK = threading.Lock()
+_ACTIVITY_INDEX_LOCK = threading.Lock()
+_pending_activity_updates = 0
+_last_activity_flush = time.time()
 
 # Configure allowed file extensions
-ALLOWED_EXTENSIONS = {'txt', 'csv', 'dat', 'tsv'}
+ALLOWED_EXTENSIONS = frozenset({'txt', 'csv', 'dat', 'tsv'})
 
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    _, dot, extension = filename.rpartition('.')
+    return bool(dot) and extension.lower() in ALLOWED_EXTENSIONS
+
+def save_upload(file, destination):
+    """
+    Move an uploaded file to its destination path.
+    
+    Uploads spooled by UploadRequest are renamed into place; anything else
+    (e.g. an in-memory stream) falls back to FileStorage.save.
+    
+    Args:
+        file (FileStorage): The uploaded file from request.files
+        destination (str): Path to save the file to
+    """
+    spool_path = getattr(file.stream, 'name', None)
+    if isinstance(spool_path, str) and os.path.exists(spool_path):
+        file.stream.flush()
+        try:
+            os.replace(spool_path, destination)
+            return
+        except FileNotFoundError:
+            # Destination folder is missing; let the caller recreate it
+            raise
+        except OSError as e:
+            print(f"Error moving spooled upload {spool_path}: {e}")
+    file.save(destination)
+
+def load_user_activity():
+    """Read the on-disk last-seen index, returning an empty dict if it is missing or unreadable."""
+    try:
+        with open(ACTIVITY_INDEX_PATH, 'r', encoding='utf-8') as index_file:
+            return json.load(index_file)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Error reading activity index {ACTIVITY_INDEX_PATH}: {e}")
+        return {}
+
+def flush_user_activity(expire_before=None):
+    """
+    Merge in-memory last-seen times into the on-disk index.
+    
+    Each worker process keeps its own _LAST_SEEN, so the index on disk is the
+    merged view across workers.
+    
+    Args:
+        expire_before (float, optional): Drop users last seen before this timestamp
+    
+    Returns:
+        dict: The merged user_id -> last-seen timestamp index
+    """
+    global _pending_activity_updates, _last_activity_flush
+    with _LAST_SEEN_LOCK:
+        if expire_before is not None:
+            for user_id in [uid for uid, seen in _LAST_SEEN.items() if seen < expire_before]:
+                del _LAST_SEEN[user_id]
+        snapshot = dict(_LAST_SEEN)
+        _pending_activity_updates = 0
+        _last_activity_flush = time.time()
+    
+    # The thread lock covers this process; the file lock (where fcntl is
+    # available) keeps other workers from merging and replacing at the same time
+    with _ACTIVITY_INDEX_LOCK:
+        try:
+            lock_file = open(ACTIVITY_INDEX_LOCK_PATH, 'a')
+        except OSError as e:
+            print(f"Error opening activity index lock {ACTIVITY_INDEX_LOCK_PATH}: {e}")
+            lock_file = None
+        if lock_file is not None and fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        
+        index = load_user_activity()
+        for user_id, seen in snapshot.items():
+            if seen > index.get(user_id, 0):
+                index[user_id] = seen
+        if expire_before is not None:
+            index = {uid: seen for uid, seen in index.items() if seen >= expire_before}
+        
+        tmp_file = None
+        try:
+            with tempfile.NamedTemporaryFile('w', dir=os.path.dirname(ACTIVITY_INDEX_PATH) or '.',
+                                             prefix='.last_seen-', delete=False, encoding='utf-8') as tmp_file:
+                json.dump(index, tmp_file)
+            os.replace(tmp_file.name, ACTIVITY_INDEX_PATH)
+        except Exception as e:
+            print(f"Error writing activity index {ACTIVITY_INDEX_PATH}: {e}")
+            if tmp_file is not None:
+                try:
+                    os.remove(tmp_file.name)
+                except FileNotFoundError:
+                    pass
+        
+        if lock_file is not None:
+            # Closing the file releases the lock
+            lock_file.close()
+    
+    return index
+
+def record_user_activity(user_id):
+    """
+    Note that user_id was just active, persisting the index every
+    ACTIVITY_FLUSH_EVERY visits or ACTIVITY_FLUSH_INTERVAL seconds.
+    """
+    global _pending_activity_updates, _last_activity_flush
+    with _LAST_SEEN_LOCK:
+        now = time.time()
+        _LAST_SEEN[user_id] = now
+        _pending_activity_updates += 1
+        flush_due = (_pending_activity_updates >= ACTIVITY_FLUSH_EVERY or
+                     now - _last_activity_flush >= ACTIVITY_FLUSH_INTERVAL)
+        if flush_due:
+            # Counted as flushed now so later visits don't queue more flushes
+            _pending_activity_updates = 0
+            _last_activity_flush = now
+    if flush_due:
+        CLEANUP_EXEC.submit(flush_user_activity)
+
+def flush_pending_user_activity():
+    """Persist visits recorded since the last flush, if there are any."""
+    with _LAST_SEEN_LOCK:
+        pending = _pending_activity_updates
+    if pending:
+        flush_user_activity()
+
+# Visits a worker recorded must not be lost when gunicorn recycles it
+atexit.register(flush_pending_user_activity)
 
 def get_user_folders():
     """
@@ -37,24 +247,88 @@ def get_user_folders():
     Returns:
         tuple: (upload_folder, output_folder) paths for the current user
     """
-    # Check if user has a session ID, create one if not
-    if 'user_id' not in session:
-        session['user_id'] = str(uuid.uuid4())
+    # Check if user has a session ID, create one if not. An id that is not a
+    # plain token (e.g. from a forged cookie) is replaced, since it becomes
+    # part of the folder paths.
+    user_id = session.get('user_id')
+    if not isinstance(user_id, str) or not USER_ID_PATTERN.fullmatch(user_id):
+        session['user_id'] = secrets.token_urlsafe(12)
     
     user_id = session['user_id']
+    record_user_activity(user_id)
     
-    # Create user-specific folders
-    user_upload_folder = os.path.join(BASE_UPLOAD_FOLDER, user_id)
-    user_output_folder = os.path.join(BASE_OUTPUT_FOLDER, user_id)
+    # User-specific folders, sharded by id prefix to keep directories small.
+    # The paths are always derived from the id, never read back from the
+    # cookie, so a forged session cannot point them elsewhere.
+    shard = user_id[:USER_SHARD_WIDTH]
+    user_upload_folder = f"{BASE_UPLOAD_FOLDER}/{shard}/{user_id}"
+    user_output_folder = f"{BASE_OUTPUT_FOLDER}/{shard}/{user_id}"
     
-    # Ensure directories exist
-    if not os.path.exists(user_upload_folder):
-        os.makedirs(user_upload_folder)
-    if not os.path.exists(user_output_folder):
-        os.makedirs(user_output_folder)
+    # Paths cached in the cookie by earlier versions are no longer used
+    if 'upload_folder' in session or 'output_folder' in session:
+        session.pop('upload_folder', None)
+        session.pop('output_folder', None)
+    
+    if not session.get('folders_created'):
+        session['folders_created'] = True
+        
+        # Ensure directories exist. Returning users already have them; if a
+        # sweep removed them since, home() recreates them when saving fails.
+        os.makedirs(user_upload_folder, exist_ok=True)
+        os.makedirs(user_output_folder, exist_ok=True)
     
     return user_upload_folder, user_output_folder
 
+def unlink_files_io_uring(folder, file_names):
+    """
+    Remove file_names from folder using batched io_uring unlinkat submissions.
+    
+    Each batch of up to IO_URING_QUEUE_DEPTH unlinks costs one io_uring_enter
+    call instead of one unlinkat syscall per file.
+    
+    Args:
+        folder (str): Directory containing the files
+        file_names (list): Names of the files to remove, relative to folder
+    
+    Returns:
+        int: Number of files removed
+    
+    Raises:
+        OSError: If io_uring is unavailable (old kernel or blocked by seccomp)
+    """
+    ring = liburing.Ring()
+    cqe = liburing.Cqe()
+    liburing.io_uring_queue_init(IO_URING_QUEUE_DEPTH, ring)
+    dir_fd = None
+    removed = 0
+    try:
+        dir_fd = os.open(folder, os.O_RDONLY)
+        for start in range(0, len(file_names), IO_URING_QUEUE_DEPTH):
+            batch = file_names[start:start + IO_URING_QUEUE_DEPTH]
+            for offset, file_name in enumerate(batch):
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_unlink(sqe, file_name, 0, dir_fd)
+                liburing.io_uring_sqe_set_data64(sqe, start + offset)
+            liburing.io_uring_submit_and_wait(ring, len(batch))
+            
+            # Reap completions; a failed unlink raises when its result is read
+            ready = liburing.io_uring_cq_ready(ring)
+            liburing.io_uring_wait_cqe(ring, cqe)
+            for i in range(ready):
+                completion = cqe[i]
+                file_name = file_names[completion.user_data]
+                try:
+                    completion.res
+                    removed += 1
+                except OSError as e:
+                    print(f"Error deleting file {os.path.join(folder, file_name)}: {e}")
+            liburing.io_uring_cq_advance(ring, ready)
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+        liburing.io_uring_queue_exit(ring)
+    return removed
+
 def cleanup_user_folders(user_folder, max_files=10):
     """
     Maintain and clean up user-specific folders, keeping only the most recent max_files.
@@ -65,62 +339,161 @@ def cleanup_user_folders(user_folder, max_files=10):
         max_files (int): Maximum number of files to keep (default: 10)
     """
     try:
-        # Get list of all files in the folder with their modification times
-        files = []
-        for file_path in glob.glob(os.path.join(user_folder, '*')):
-            if os.path.isfile(file_path):
-                files.append((file_path, os.path.getmtime(file_path)))
+        # Get list of all files in the folder with their modification times.
+        # scandir hands back cached DirEntry objects, so each file costs a
+        # single stat() instead of separate isfile/getmtime lookups.
+        with os.scandir(user_folder) as entries:
+            files = [(entry.path, entry.stat().st_mtime)
+                     for entry in entries if entry.is_file(follow_symlinks=False)]
         
-        # Sort files by modification time (newest first)
-        files.sort(key=lambda x: x[1], reverse=True)
+        # Keep only the most recent max_files (a bounded heap instead of a full sort)
+        keep = {file_path for file_path, _ in heapq.nlargest(max_files, files, key=operator.itemgetter(1))}
+        files_to_delete = [(file_path, mtime) for file_path, mtime in files if file_path not in keep]
         
-        # Keep only the most recent max_files
-        files_to_delete = files[max_files:]
-        
-        # Delete older files
-        for file_path, _ in files_to_delete:
+        # Delete older files: one io_uring submission per batch when available,
+        # otherwise a single rm call for large backlogs on POSIX
+        if files_to_delete and liburing is not None and os.name == 'posix':
             try:
-                os.remove(file_path)
-                print(f"Deleted old file: {file_path}")
-            except Exception as e:
-                print(f"Error deleting file {file_path}: {e}")
+                removed = unlink_files_io_uring(
+                    user_folder, [os.path.basename(file_path) for file_path, _ in files_to_delete]
+                )
+                print(f"Deleted {removed} old files from {user_folder}")
+                return len(files_to_delete)
+            except OSError as e:
+                print(f"io_uring unlink unavailable, falling back: {e}")
+        
+        if len(files_to_delete) > BATCH_DELETE_THRESHOLD and os.name == 'posix':
+            result = subprocess.run(
+                ['rm', '-f', '--', *[file_path for file_path, _ in files_to_delete]],
+                check=False
+            )
+            if result.returncode == 0:
+                print(f"Deleted {len(files_to_delete)} old files from {user_folder}")
+            else:
+                print(f"Error batch deleting files in {user_folder}: rm exited with {result.returncode}")
+        else:
+            for file_path, _ in files_to_delete:
+                try:
+                    os.remove(file_path)
+                    print(f"Deleted old file: {file_path}")
+                except Exception as e:
+                    print(f"Error deleting file {file_path}: {e}")
         
         return len(files_to_delete)
     except Exception as e:
         print(f"Error cleaning up folder {user_folder}: {e}")
         return 0
 
+def iter_user_folder_entries(base_folder):
+    """
+    Yield a DirEntry for every user folder under base_folder.
+    
+    Walks both the sharded layout (base/<shard>/<user_id>) and legacy flat
+    user folders (base/<user_id>) created before sharding.
+    """
+    with os.scandir(base_folder) as entries:
+        top_level = [entry for entry in entries if entry.is_dir(follow_symlinks=False)]
+    
+    for entry in top_level:
+        if len(entry.name) != USER_SHARD_WIDTH:
+            yield entry
+            continue
+        with os.scandir(entry.path) as shard_entries:
+            yield from [shard_entry for shard_entry in shard_entries
+                        if shard_entry.is_dir(follow_symlinks=False)]
+
 def cleanup_inactive_users(base_folder, max_age_days=7):
     """
-    Clean up folders for inactive users (folders not accessed in the last max_age_days).
+    Clean up folders for inactive users (users not seen in the last max_age_days).
+    
+    Activity comes from the last-seen index maintained by get_user_folders.
+    Folders missing from the index (e.g. created before it existed) fall back
+    to their modification time, so only those need a stat() call.
     
     Args:
-        base_folder (str): Base folder containing user folders
-        max_age_days (int): Maximum number of days since last access before removal
+        base_folder (str): Base folder containing (sharded) user folders
+        max_age_days (int): Maximum number of days since last activity before removal
     """
     try:
         current_time = time.time()
         max_age_seconds = max_age_days * 24 * 60 * 60
+        last_seen = flush_user_activity(expire_before=current_time - max_age_seconds)
         
         # Check each user folder
-        for user_folder in glob.glob(os.path.join(base_folder, '*')):
-            if os.path.isdir(user_folder):
-                # Get the last access time of the folder
-                last_access_time = os.path.getatime(user_folder)
-                
-                # If folder hasn't been accessed in max_age_days, remove it
-                if current_time - last_access_time > max_age_seconds:
-                    try:
-                        shutil.rmtree(user_folder)
-                        print(f"Removed inactive user folder: {user_folder}")
-                    except Exception as e:
-                        print(f"Error removing inactive user folder {user_folder}: {e}")
+        user_folders = [(entry.path, last_seen.get(entry.name) or entry.stat().st_mtime)
+                        for entry in iter_user_folder_entries(base_folder)]
+        
+        for user_folder, last_access_time in user_folders:
+            # If the user hasn't been active in max_age_days, remove the folder
+            if current_time - last_access_time > max_age_seconds:
+                try:
+                    shutil.rmtree(user_folder)
+                    print(f"Removed inactive user folder: {user_folder}")
+                except Exception as e:
+                    print(f"Error removing inactive user folder {user_folder}: {e}")
     except Exception as e:
         print(f"Error cleaning up inactive users: {e}")
 
-@app.route('/custom.css')
-def custom_css():
-    css = """
+def claim_inactive_sweep(interval=INACTIVE_SWEEP_INTERVAL):
+    """
+    Decide whether this process should sweep inactive user folders now.
+    
+    The modification time of SWEEP_MARKER_PATH is the time of the last sweep
+    by any worker. The worker that finds it older than interval touches it
+    before sweeping (holding an exclusive lock where fcntl is available), so
+    only one worker sweeps per interval.
+    
+    Returns:
+        bool: True if the caller claimed the sweep
+    """
+    try:
+        fd = os.open(SWEEP_MARKER_PATH, os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+    except FileExistsError:
+        fd = os.open(SWEEP_MARKER_PATH, os.O_WRONLY)
+    else:
+        # No sweep has run yet; creating the marker claims the first one
+        os.close(fd)
+        return True
+    
+    try:
+        if fcntl is not None:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # Another worker is claiming this sweep right now
+                return False
+        if time.time() - os.fstat(fd).st_mtime < interval:
+            return False
+        os.utime(SWEEP_MARKER_PATH)
+        return True
+    finally:
+        os.close(fd)
+
+def _sweep_loop(check_interval=INACTIVE_SWEEP_CHECK_INTERVAL):
+    """Remove inactive user folders once per INACTIVE_SWEEP_INTERVAL across all workers, off the request path."""
+    # A random first delay keeps freshly started workers from checking together
+    time.sleep(random.uniform(0, check_interval))
+    while True:
+        # Every worker persists its recent visits, so whichever one sweeps
+        # sees them all
+        flush_pending_user_activity()
+        try:
+            claimed = claim_inactive_sweep()
+        except Exception as e:
+            print(f"Error checking sweep marker {SWEEP_MARKER_PATH}: {e}")
+            claimed = False
+        if claimed:
+            cleanup_inactive_users(BASE_UPLOAD_FOLDER)
+            cleanup_inactive_users(BASE_OUTPUT_FOLDER)
+        time.sleep(check_interval)
+
+threading.Thread(target=_sweep_loop, name='inactive-user-sweep', daemon=True).start()
+
+# Static stylesheet and scripts are built once at import time and served with
+# long-lived cache headers, so browsers only re-fetch them after a deploy
+STATIC_CACHE_MAX_AGE = 86400
+
+CUSTOM_CSS = """
     /* Navbar styles */
     .navbar {
         background: linear-gradient(135deg, #2563eb, #3b82f6);
@@ -239,15 +612,38 @@ def custom_css():
         }
     }
     """
-    return Response(css, mimetype='text/css')
+_CSS_BYTES = CUSTOM_CSS.encode('utf-8')
+_CSS_ETAG = hashlib.md5(_CSS_BYTES).hexdigest()
+
+def cached_static_response(body, mimetype, etag):
+    """
+    Build a cacheable response for a precomputed static body.
+    
+    Answers 304 Not Modified when the browser already holds the same ETag.
+    """
+    response = Response(body, mimetype=mimetype)
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = STATIC_CACHE_MAX_AGE
+    return response.make_conditional(request)
+
+@app.route('/custom.css')
+def custom_css():
+    return cached_static_response(_CSS_BYTES, 'text/css', _CSS_ETAG)
+
+# Rendered navbar, re-rendered only when the template file changes on disk
+_NAV_CACHE = {'mtime': 0, 'html': None}
 
 @app.route('/navbar')
 def navbar():
-    return render_template('navbar.html')
+    template_path = app.jinja_env.get_template('navbar.html').filename
+    mtime = os.stat(template_path).st_mtime
+    if _NAV_CACHE['html'] is None or _NAV_CACHE['mtime'] != mtime:
+        _NAV_CACHE['html'] = render_template('navbar.html')
+        _NAV_CACHE['mtime'] = mtime
+    return _NAV_CACHE['html']
 
-@app.route('/custom_scripts')
-def custom_scripts():
-    js = """
+CUSTOM_SCRIPTS = """
     <script>
     document.addEventListener('DOMContentLoaded', function() {
         // Initialize Bootstrap components
@@ -269,7 +665,24 @@ def custom_scripts():
     });
     </script>
     """
-    return js
+_JS_BYTES = CUSTOM_SCRIPTS.encode('utf-8')
+_JS_ETAG = hashlib.md5(_JS_BYTES).hexdigest()
+
+def custom_scripts():
+    return CUSTOM_SCRIPTS
+
+@app.route('/custom_scripts', endpoint='custom_scripts')
+def custom_scripts_view():
+    return cached_static_response(_JS_BYTES, 'text/html', _JS_ETAG)
+
+# Rendered index page, built on the first GET without flashed messages
+_INDEX_CACHE = {'html': None}
+
+def render_index():
+    return render_template('index.html', 
+                           navbar=navbar(), 
+                           custom_css=url_for('custom_css'),
+                           custom_scripts=custom_scripts())
 
 @app.route('/home')
 def home_redirect():
@@ -296,8 +709,14 @@ def home():
         
         if file and allowed_file(file.filename):
             filename = secure_filename(file.filename)
-            input_filepath = os.path.join(user_upload_folder, filename)
-            file.save(input_filepath)
+            input_filepath = f"{user_upload_folder}/{filename}"
+            try:
+                save_upload(file, input_filepath)
+            except FileNotFoundError:
+                # The user's folders were swept since they were created; recreate them
+                os.makedirs(user_upload_folder, exist_ok=True)
+                os.makedirs(user_output_folder, exist_ok=True)
+                save_upload(file, input_filepath)
             
             # Get form data
             delimiter_option = request.form.get('delimiter_option', 'standard')
@@ -314,43 +733,41 @@ def home():
             
             # Define output paths
             base_filename = os.path.splitext(filename)[0]
-            output_filepath = os.path.join(user_output_folder, f"{base_filename}_corrected.txt")
-            error_filepath = os.path.join(user_output_folder, f"{base_filename}_errors.log")
-            error_transactions_filepath = os.path.join(user_output_folder, f"{base_filename}_error_transactions.txt")
+            output_filepath = f"{user_output_folder}/{base_filename}_corrected.txt"
+            error_filepath = f"{user_output_folder}/{base_filename}_errors.log"
+            error_transactions_filepath = f"{user_output_folder}/{base_filename}_error_transactions.txt"
             
-            # Process the file
+            # Process the file (imported here so workers boot and serve other
+            # routes without loading the processing module)
+            from data_shifting import fix_data_shifting, ProcessingResult
+            result = ProcessingResult()
             try:
-                fix_data_shifting(
-                    Path(input_filepath), 
-                    Path(output_filepath), 
-                    Path(error_filepath),
-                    Path(error_transactions_filepath),
+                result = fix_data_shifting(
+                    input_filepath, 
+                    output_filepath, 
+                    error_filepath,
+                    error_transactions_filepath,
                     delimiter, 
                     qualifier
                 )
             except FileNotFoundError as e:
                 # Catch any FileNotFoundError that might be raised if files don't exist
                 print(f"FileNotFoundError during processing: {e}")
-                # Continue execution - we'll check which files were created next
+                # Continue execution - the corrected file may still have been written
             except Exception as e:
                 # Log other errors but allow the process to continue
                 print(f"Error during processing: {e}")
             
-            # Clean up user folders after processing
-            deleted_upload_count = cleanup_user_folders(user_upload_folder)
-            deleted_output_count = cleanup_user_folders(user_output_folder, max_files=20)  # Keep more output files
-            
-            # Periodically clean up inactive user folders (run this occasionally)
-            if random.random() < 0.1:  # 10% chance to run on any request
-                cleanup_inactive_users(BASE_UPLOAD_FOLDER)
-                cleanup_inactive_users(BASE_OUTPUT_FOLDER)
+            # Clean up user folders after processing (in the background)
+            CLEANUP_EXEC.submit(cleanup_user_folders, user_upload_folder)
+            CLEANUP_EXEC.submit(cleanup_user_folders, user_output_folder, max_files=20)  # Keep more output files
             
             # Check which files were actually created
             output_file = f"{base_filename}_corrected.txt"
             
-            # Check if error files exist (they may not be created if there were no errors)
-            error_file = f"{base_filename}_errors.log" if os.path.exists(os.path.join(user_output_folder, f"{base_filename}_errors.log")) else None
-            error_transactions_file = f"{base_filename}_error_transactions.txt" if os.path.exists(os.path.join(user_output_folder, f"{base_filename}_error_transactions.txt")) else None
+            # Error files are only created when there were errors to report
+            error_file = f"{base_filename}_errors.log" if result.error_log_written else None
+            error_transactions_file = f"{base_filename}_error_transactions.txt" if result.error_transactions_written else None
             
             return render_template(
                 'results.html',
@@ -367,25 +784,28 @@ def home():
             flash(f'File type not allowed. Please upload one of the following types: {", ".join(ALLOWED_EXTENSIONS)}')
             return redirect(request.url)
     
-    # GET request
-    return render_template('index.html', 
-                           navbar=navbar(), 
-                           custom_css=url_for('custom_css'),
-                           custom_scripts=custom_scripts())
+    # GET request. The page only varies by flashed messages, so serve the
+    # prebuilt copy whenever there are none (and templates aren't reloading)
+    if '_flashes' in session or app.jinja_env.auto_reload:
+        return render_index()
+    if _INDEX_CACHE['html'] is None:
+        _INDEX_CACHE['html'] = render_index().encode('utf-8')
+    return Response(_INDEX_CACHE['html'], mimetype='text/html')
 
 @app.route('/download/<filename>')
 def download_file(filename):
     # Get user-specific output folder
     _, user_output_folder = get_user_folders()
     
-    file_path = os.path.join(user_output_folder, filename)
+    file_path = f"{user_output_folder}/{filename}"
     
-    # Check if file exists
-    if not os.path.exists(file_path):
+    # Conditional responses let browsers revalidate re-downloads with a 304, and
+    # passing the path (not an open file) lets the server use wsgi.file_wrapper/sendfile
+    try:
+        return send_file(file_path, as_attachment=True, conditional=True, etag=True)
+    except FileNotFoundError:
         flash(f"File {filename} does not exist")
         return redirect(url_for('home'))
-        
-    return send_file(file_path, as_attachment=True)
 
 if __name__ == '__main__':
     app.run(debug=True) 
\ No newline at end of file
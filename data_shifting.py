@@ -53,6 +53,277 @@ import sys
 from pathlib import Path
 import tempfile
 import os
+import secrets
+import functools
+import codecs
+import itertools
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+
+# Newlines and tabs inside quoted text are replaced with spaces
+_QUOTED_WHITESPACE = str.maketrans('\r\n\t', '   ')
+
+# Runs of two or more spaces inside quoted text are collapsed to one
+_MULTIPLE_SPACES = re.compile(r'  +')
+
+# Inch measurements: number + optional fraction + " + optional space +
+# letter/number, or the end of the line (see fix_embedded_quotes)
+_INCH_MEASUREMENT = re.compile(r'(\d+(?:-\d+/\d+)?)"(\s*[A-Za-z0-9]|\s*$)')
+
+# Finds a " that _INCH_MEASUREMENT would rewrite: one right after a digit and
+# followed by what its second group accepts. Starting from the literal " lets
+# the regex engine skip ahead to each quote, so lines without any inch marks
+# are ruled out far faster than by running the substitution itself
+_INCH_MEASUREMENT_QUOTE = re.compile(r'"(?<=\d")(?=\s*[A-Za-z0-9]|\s*$)')
+
+# Delimiters and qualifiers that are auto-detected, in order of preference
+_DELIMITER_CANDIDATES = ('|^|', ',', '|', '\t', ';')
+_QUALIFIER_CANDIDATES = ('"', "'")
+
+# Matches any candidate. '|^|' is tried first at each position, so a '|'
+# found on its own is never part of a '|^|'
+_CANDIDATE_PATTERN = re.compile(
+    '|'.join(map(re.escape, _DELIMITER_CANDIDATES + _QUALIFIER_CANDIDATES))
+)
+
+# Files smaller than this are analyzed in-process; starting worker processes
+# would cost more than it saves
+PARALLEL_MIN_FILE_SIZE = 1 << 20
+
+# Lines sent to a worker process at a time
+PARALLEL_BATCH_LINES = 1000
+
+# Worker processes used for large files, from PARALLEL_WORKERS in the
+# environment (default: one per CPU). app.py sets it to 1, since every web
+# worker would otherwise start its own pool; 1 keeps the analysis in-process.
+PARALLEL_WORKERS = int(os.environ.get('PARALLEL_WORKERS', 0)) or os.cpu_count() or 1
+
+# The pool is started on first use and kept for later files in this process
+_PARALLEL_POOL = None
+_PARALLEL_POOL_LOCK = threading.Lock()
+
+@dataclass
+class ProcessingResult:
+    """Which optional output files a fix_data_shifting run actually wrote."""
+    error_log_written: bool = False
+    error_transactions_written: bool = False
+
+class LookaheadLines:
+    """
+    Index-addressable view over a stream of lines that only keeps the lines
+    from the current position onwards in memory, so the multi-line logic can
+    look ahead without the whole file being read into a list.
+    
+    The stream yields (line, analysis) pairs, where analysis is the line's
+    (column_count, cleaned_line) if it was worked out ahead of time, else None.
+    """
+    
+    def __init__(self, lines):
+        self._lines = iter(lines)
+        self._window = deque()
+        self._start = 0  # Index of the first line still held in the window
+    
+    @property
+    def count(self):
+        """Number of lines read from the stream so far."""
+        return self._start + len(self._window)
+    
+    def has(self, index):
+        """Return True if there is a line at index, reading ahead as needed."""
+        while index >= self.count:
+            item = next(self._lines, None)
+            if item is None:
+                return False
+            self._window.append(item)
+        return True
+    
+    def __getitem__(self, index):
+        self.has(index)
+        return self._window[index - self._start][0]
+    
+    def analysis(self, index):
+        """Return the precomputed (column_count, cleaned_line) for index, or None."""
+        self.has(index)
+        return self._window[index - self._start][1]
+    
+    def release(self, index):
+        """Drop the lines before index; they will not be looked at again."""
+        while self._start < index and self._window:
+            self._window.popleft()
+            self._start += 1
+
+class CorrectedLineWriter:
+    """
+    Clean corrected lines and write them to the output file as soon as they
+    are decided. Lines are separated by newlines with none after the last one.
+    The lines go to a temporary file next to the output, which replaces the
+    output only when close() succeeds, so the input can be the output file
+    and a failed run leaves no partial result behind.
+    A write error is kept and raised from close() so processing can finish
+    and report it the same way as before.
+    """
+    
+    def __init__(self, output_path, delimiter, qualifier):
+        self.delimiter = delimiter
+        self.qualifier = qualifier
+        self.output_path = output_path
+        self.lines_written = 0
+        self._error = None
+        self._file = None
+        self._temp_path = os.path.join(
+            os.path.dirname(output_path) or '.',
+            f".{os.path.basename(output_path)}.{secrets.token_hex(8)}.tmp"
+        )
+        try:
+            # Created with mode 0o666 so the umask gives the output the
+            # permissions open() would, which tempfile's private files lack
+            fd = os.open(self._temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+            # A large buffer turns the many small line writes into few syscalls
+            self._file = os.fdopen(fd, 'w', encoding='utf-8', buffering=1 << 20)
+        except Exception as e:
+            self._error = e
+    
+    def write(self, line, cleaned_line=None):
+        if cleaned_line is None:
+            cleaned_line = clean_qualified_content(line, self.delimiter, self.qualifier)
+        self.lines_written += 1
+        if self._error is not None:
+            return
+        try:
+            if self.lines_written > 1:
+                self._file.write('\n')
+            self._file.write(cleaned_line)
+        except Exception as e:
+            self._error = e
+    
+    def close(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+                if self._error is None:
+                    # Keep the permissions of an output being overwritten
+                    try:
+                        os.chmod(self._temp_path, os.stat(self.output_path).st_mode & 0o7777)
+                    except FileNotFoundError:
+                        pass
+                    os.replace(self._temp_path, self.output_path)
+            except Exception as e:
+                if self._error is None:
+                    self._error = e
+            if self._error is not None:
+                self._remove_temporary_file()
+            self._file = None
+        if self._error is not None:
+            raise self._error
+    
+    def discard(self):
+        """Close and delete the temporary file without touching the output."""
+        if self._file is not None:
+            try:
+                self._file.close()
+            except Exception:
+                pass
+            self._remove_temporary_file()
+            self._file = None
+    
+    def _remove_temporary_file(self):
+        try:
+            os.unlink(self._temp_path)
+        except OSError:
+            pass
+
+def detect_file_encoding(input_path, chunk_size=1 << 20):
+    """
+    Return 'utf-8' if the whole file decodes as UTF-8, otherwise 'latin-1'.
+    Decodes in chunks so the file is never held in memory at once.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    with open(input_path, 'rb') as file:
+        try:
+            for chunk in iter(lambda: file.read(chunk_size), b''):
+                decoder.decode(chunk)
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            return 'latin-1'
+    return 'utf-8'
+
+def read_lines(input_path, encoding):
+    """
+    Yield the lines of the input file one at a time, without line endings.
+    Text mode turns \r\n and \r into \n, so a line can only end in '\n'.
+    """
+    with open(input_path, 'r', encoding=encoding) as file:
+        for line in file:
+            yield line[:-1] if line.endswith('\n') else line
+
+def analyze_line(line, delimiter, qualifier):
+    """
+    Return (column_count, cleaned_line) for a line. Both come from the same
+    fix_embedded_quotes result, which count_columns and
+    clean_qualified_content would each work out again.
+    """
+    fixed_line = fix_embedded_quotes(line, delimiter, qualifier)
+    return (scan_columns(fixed_line, delimiter, qualifier),
+            clean_fixed_line(fixed_line, delimiter, qualifier))
+
+def analyze_lines(lines, delimiter, qualifier):
+    """Return the (column_count, cleaned_line) pair for each of the lines."""
+    return [analyze_line(line, delimiter, qualifier) for line in lines]
+
+def get_parallel_pool(workers):
+    """
+    Return this process's worker pool, starting it on first use.
+    
+    Workers come from a forkserver (spawn where that is unavailable) rather
+    than a fork of this process, which may be running threads that hold locks.
+    """
+    global _PARALLEL_POOL
+    with _PARALLEL_POOL_LOCK:
+        if _PARALLEL_POOL is None:
+            start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _PARALLEL_POOL = ProcessPoolExecutor(max_workers=workers,
+                                                 mp_context=multiprocessing.get_context(start_method))
+        return _PARALLEL_POOL
+
+def discard_parallel_pool(pool):
+    """Shut down pool if it is still this process's pool, so the next file starts a fresh one."""
+    global _PARALLEL_POOL
+    with _PARALLEL_POOL_LOCK:
+        if _PARALLEL_POOL is pool:
+            _PARALLEL_POOL = None
+    pool.shutdown(wait=False)
+
+def analyze_lines_in_parallel(lines, delimiter, qualifier, workers):
+    """
+    Yield (line, analysis) for each line, with the column counting and
+    cleaning done in batches on a pool of worker processes. Each line is
+    analyzed on its own, so the results are exactly what the serial code
+    would get; joining multi-line transactions stays with the caller.
+    Only a few batches are in flight at once so memory use stays bounded.
+    """
+    pending = deque()
+    executor = get_parallel_pool(workers)
+    try:
+        while True:
+            batch = list(itertools.islice(lines, PARALLEL_BATCH_LINES))
+            if batch:
+                pending.append((batch, executor.submit(analyze_lines, batch, delimiter, qualifier)))
+            if pending and (not batch or len(pending) > 2 * workers):
+                batch, future = pending.popleft()
+                yield from zip(batch, future.result())
+            elif not batch:
+                return
+    except BrokenProcessPool:
+        discard_parallel_pool(executor)
+        raise
+    finally:
+        # Batches of a run that stopped early are not needed any more
+        for _, future in pending:
+            future.cancel()
 
 def parse_args():
     """Parse command line arguments."""
@@ -73,26 +344,49 @@ def parse_args():
 def detect_delimiter_and_qualifier(first_line):
     """Try to automatically detect delimiter and text qualifier from the first line."""
     # Common delimiters to check
-    delimiters = ['|^|', ',', '|', '\t', ';']
-    qualifiers = ['"', "'"]
+    delimiters = _DELIMITER_CANDIDATES
+    qualifiers = _QUALIFIER_CANDIDATES
     
     detected_delimiter = None
     detected_qualifier = None
     
+    # Find which candidates occur with one scan of the line
+    found = set(_CANDIDATE_PATTERN.findall(first_line))
+    
     # Try to detect delimiter
     for delimiter in delimiters:
-        if delimiter in first_line:
+        if delimiter in found:
             detected_delimiter = delimiter
             break
     
     # Try to detect qualifier
     for qualifier in qualifiers:
-        if qualifier in first_line:
+        if qualifier in found:
             detected_qualifier = qualifier
             break
             
     return detected_delimiter, detected_qualifier
 
+@functools.lru_cache(maxsize=None)
+def closing_qualifier_pattern(delimiter, qualifier):
+    """
+    Compile the matcher for a qualifier that closes a quoted field, i.e. one
+    followed by optional whitespace and then the delimiter or end of line.
+    
+    Group 1 is the whitespace and group 2 the delimiter (None at end of line).
+    The whitespace is consumed atomically, as the character loop used to skip
+    it before checking for the delimiter. Cached per (delimiter, qualifier) so
+    every line of a file shares one compiled pattern.
+    """
+    return re.compile(
+        re.escape(qualifier) + r'(?=(\s*))\1(?:(' + re.escape(delimiter) + r')|\Z)'
+    )
+
+@functools.lru_cache(maxsize=None)
+def double_qualifier_pattern(delimiter, qualifier):
+    """Compile the qualifier + qualifier + delimiter pattern, cached per dialect."""
+    return re.compile(re.escape(qualifier + qualifier + delimiter))
+
 def fix_embedded_quotes(line, delimiter, qualifier):
     """
     Enhanced fix for embedded quotes in specific problem patterns.
@@ -119,51 +413,115 @@ def fix_embedded_quotes(line, delimiter, qualifier):
     
     # Pattern 3: Complex inch measurements like "9-1/2" or "5" W x 9.5" H x 2.5" D"
     # This regex looks for patterns like: number + optional fraction + " + optional space + letter/number
-    inch_pattern = r'(\d+(?:-\d+/\d+)?)"(\s*[A-Za-z0-9]|\s*$)'
+    # (compiled once at module level as _INCH_MEASUREMENT)
     
-    # Apply inch pattern fixes first
-    result = re.sub(inch_pattern, r'\1 inches\2', result)
+    # Apply inch pattern fixes first; most lines have none, which a quick
+    # probe for the quote of a match can tell
+    if _INCH_MEASUREMENT_QUOTE.search(result):
+        result = _INCH_MEASUREMENT.sub(r'\1 inches\2', result)
     
-    # Find all occurrences of double quote + delimiter pattern
-    pos = 0
-    while True:
-        pos = result.find(double_quote_pattern, pos)
-        if pos == -1:
-            break
+    if set(delimiter).isdisjoint(" inches" + qualifier):
+        # Rewrite all double quote + delimiter occurrences in one regex pass.
+        # The replacement text can neither form nor break a delimiter here, so
+        # each match can be checked against the string as it was before the pass.
+        # Example: "CAP-GOWN PKG ULTRA NAVY 60""|^| -> "CAP-GOWN PKG ULTRA NAVY 60 inches"|^|
+        text = result
+        
+        def replace_double_quote(match):
+            pos = match.start()
             
-        # Now we need to check if there's content before this pattern
-        # First, find the previous delimiter or start of string
-        prev_delim_pos = result.rfind(delimiter, 0, pos)
-        if prev_delim_pos == -1:
-            prev_delim_pos = 0
-        else:
-            prev_delim_pos += len(delimiter)
+            # Only a digit before the double quotes can make this a measurement
+            # in inches; test that first since it is the cheapest check. Other
+            # embedded quotes like "Splash pages"" are left for the main
+            # processing functions
+            if pos == 0 or not text[pos-1].isdigit():
+                return match.group()
+            
+            # Find the previous delimiter or start of string
+            prev_delim_pos = text.rfind(delimiter, 0, pos)
+            if prev_delim_pos == -1:
+                prev_delim_pos = 0
+            else:
+                prev_delim_pos += len(delimiter)
             
-        # Check if there's a qualifier after the previous delimiter
-        if result[prev_delim_pos:prev_delim_pos+len(qualifier)] == qualifier:
-            # There's a qualifier, so we have a proper field
-            field_start = prev_delim_pos + len(qualifier)
+            # The field must be qualified and have content before the double quotes
+            if text.startswith(qualifier, prev_delim_pos) and pos > prev_delim_pos + len(qualifier):
+                return " inches" + match.group()[len(qualifier):]
             
-            # If there's content between the start qualifier and the double quotes at pos
-            if pos > field_start:
-                # Check if the character before the double quotes is a digit
-                # This would suggest it's a measurement in inches
-                if pos > 0 and result[pos-1].isdigit():
-                    # For measurements like "60""
-                    result = result[:pos] + " inches" + result[pos+len(qualifier):]
-                    # Adjust pos to account for the replacement
-                    pos += len(" inches")
+            return match.group()
+        
+        result = double_qualifier_pattern(delimiter, qualifier).sub(replace_double_quote, text)
+    else:
+        # The replacement text may form or break delimiters here, so each
+        # occurrence is checked against the text as rewritten so far. That
+        # text is built up front to back in rewritten, with the rest of the
+        # line still untouched in text from text_pos on, so a replacement
+        # does not copy the whole line again
+        text = result
+        rewritten = ''
+        text_pos = 0
+        # Start of the last delimiter lying wholly in rewritten, moved forward
+        # as it grows so the previous delimiter is never searched for from
+        # the start of the line
+        last_delim_pos = -1
+        scanned_length = 0
+        
+        # Find all occurrences of double quote + delimiter pattern
+        pos = 0
+        while True:
+            pos = text.find(double_quote_pattern, pos)
+            if pos == -1:
+                break
+            
+            # Bring the rewritten text up to this occurrence
+            rewritten += text[text_pos:pos]
+            text_pos = pos
+            new_delim_pos = rewritten.rfind(delimiter, max(0, scanned_length - len(delimiter) + 1))
+            if new_delim_pos != -1:
+                last_delim_pos = new_delim_pos
+            scanned_length = len(rewritten)
+            
+            # Only the part from the previous delimiter on is looked at, up to
+            # the first qualifier of the double quotes at field_end
+            window_start = max(last_delim_pos, 0)
+            window = rewritten[window_start:] + text[pos:pos + len(qualifier)]
+            field_end = len(rewritten) - window_start
+                
+            # Now we need to check if there's content before this pattern
+            # First, find the previous delimiter or start of string
+            prev_delim_pos = window.rfind(delimiter, 0, field_end)
+            if prev_delim_pos == -1:
+                prev_delim_pos = 0
+            else:
+                prev_delim_pos += len(delimiter)
+                
+            # Check if there's a qualifier after the previous delimiter
+            if window.startswith(qualifier, prev_delim_pos):
+                # There's a qualifier, so we have a proper field
+                field_start = prev_delim_pos + len(qualifier)
+                
+                # If there's content between the start qualifier and the double quotes at pos
+                if field_end > field_start:
+                    # Check if the character before the double quotes is a digit
+                    # This would suggest it's a measurement in inches
+                    if field_end > 0 and window[field_end-1].isdigit():
+                        # For measurements like "60""
+                        rewritten += " inches"
+                        # Continue after the replaced qualifier
+                        text_pos = pos = pos + len(qualifier)
+                    else:
+                        # For other embedded quotes like "Splash pages""
+                        # We need a different approach - keep the quotes but ensure they're processed correctly
+                        # Skip this double quote for now as it will be handled in the main processing functions
+                        pos += len(qualifier)
                 else:
-                    # For other embedded quotes like "Splash pages""
-                    # We need a different approach - keep the quotes but ensure they're processed correctly
-                    # Skip this double quote for now as it will be handled in the main processing functions
+                    # Move past this occurrence
                     pos += len(qualifier)
             else:
                 # Move past this occurrence
-                pos += len(qualifier)
-        else:
-            # Move past this occurrence
-            pos += len(double_quote_pattern)
+                pos += len(double_quote_pattern)
+        
+        result = rewritten + text[text_pos:]
     
     # Handle double quotes at end of line (multi-line cases)
     if result.endswith(qualifier + qualifier):
@@ -186,86 +544,193 @@ def count_columns(line, delimiter, qualifier):
     # Apply special fix for embedded quotes like inches marks
     fixed_line = fix_embedded_quotes(line, delimiter, qualifier)
     
-    # Enhanced column counting logic
-    in_quoted_field = False
-    current_pos = 0
-    column_count = 1  # Start with 1 for the first column
+    return scan_columns(fixed_line, delimiter, qualifier)
+
+def scan_columns(fixed_line, delimiter, qualifier, current_pos=0, column_count=1,
+                 in_quoted_field=False, checkpoints=None):
+    """
+    Count the columns of a line already passed through fix_embedded_quotes.
     
-    while current_pos < len(fixed_line):
-        # Check for qualifier
-        if fixed_line[current_pos:current_pos+len(qualifier)] == qualifier:
-            if not in_quoted_field:
-                # Start of quoted field
-                in_quoted_field = True
-                current_pos += len(qualifier)
+    The scan can resume from a saved state (position, columns so far and
+    whether it is inside a quoted field). If a checkpoints list is given, the
+    state is appended to it at every field boundary; each saved state depends
+    only on the text before its position plus len(delimiter) + len(qualifier)
+    characters of lookahead.
+    """
+    # Enhanced column counting logic: jump between qualifiers and delimiters
+    # with str.find instead of stepping through every character
+    closing_quote = closing_qualifier_pattern(delimiter, qualifier)
+    # A delimiter sharing no characters with the qualifier can never overlap
+    # one, so the unquoted text between quoted fields can be handled in bulk
+    plain_delimiter = set(delimiter).isdisjoint(qualifier)
+    # A one-character qualifier is tried at every position inside a quoted
+    # field, which is exactly what a regex search does
+    single_char_qualifier = len(qualifier) == 1
+    line_length = len(fixed_line)
+    qualifier_length = len(qualifier)
+    delimiter_length = len(delimiter)
+    next_qualifier = fixed_line.find(qualifier, current_pos)
+    next_delimiter = fixed_line.find(delimiter, current_pos)
+    
+    while current_pos < line_length:
+        if in_quoted_field:
+            if single_char_qualifier:
+                # Embedded quotes never end the field, so search straight for
+                # the qualifier that does, skipping the whole quoted body
+                field_end = closing_quote.search(fixed_line, current_pos)
+                if not field_end:
+                    break
             else:
-                # Potential end of quoted field
-                # Look ahead to see if this is actually a field boundary
-                next_pos = current_pos + len(qualifier)
+                # Skip the whole quoted body up to the next qualifier
+                qualifier_pos = fixed_line.find(qualifier, current_pos)
+                if qualifier_pos == -1:
+                    break
                 
-                # Skip any whitespace after the quote
-                while next_pos < len(fixed_line) and fixed_line[next_pos].isspace():
-                    next_pos += 1
-                
-                # Check if followed by delimiter or end of line
-                if next_pos >= len(fixed_line) or fixed_line[next_pos:next_pos+len(delimiter)] == delimiter:
-                    # This is indeed the end of the quoted field
-                    in_quoted_field = False
-                    current_pos = next_pos
-                    
-                    # If not at the end, then we've found a new column
-                    if next_pos < len(fixed_line) and fixed_line[next_pos:next_pos+len(delimiter)] == delimiter:
-                        column_count += 1
-                        current_pos += len(delimiter)
-                else:
+                # Potential end of quoted field: check whether it is followed by
+                # optional whitespace and then the delimiter or end of line
+                field_end = closing_quote.match(fixed_line, qualifier_pos)
+                if not field_end:
                     # This is an embedded quote, not a closing quote
-                    current_pos += len(qualifier)
-        elif not in_quoted_field and fixed_line[current_pos:current_pos+len(delimiter)] == delimiter:
-            # Found a delimiter outside quoted field - new column
-            column_count += 1
-            current_pos += len(delimiter)
+                    current_pos = qualifier_pos + qualifier_length
+                    continue
+            
+            # This is indeed the end of the quoted field
+            in_quoted_field = False
+            current_pos = field_end.end()
+            
+            # If not at the end, then we've found a new column
+            if field_end.group(2) is not None:
+                column_count += 1
+                if checkpoints is not None:
+                    checkpoints.append((current_pos, column_count, False))
+        elif plain_delimiter:
+            # Count all delimiters up to the next qualifier in one pass
+            qualifier_pos = fixed_line.find(qualifier, current_pos)
+            if qualifier_pos == -1:
+                column_count += fixed_line.count(delimiter, current_pos)
+                break
+            column_count += fixed_line.count(delimiter, current_pos, qualifier_pos)
+            
+            # Start of quoted field
+            in_quoted_field = True
+            current_pos = qualifier_pos + qualifier_length
+            if checkpoints is not None:
+                checkpoints.append((current_pos, column_count, True))
         else:
-            # Regular character, just move forward
-            current_pos += 1
+            # Refresh the cached positions only once they fall behind
+            if 0 <= next_qualifier < current_pos:
+                next_qualifier = fixed_line.find(qualifier, current_pos)
+            if 0 <= next_delimiter < current_pos:
+                next_delimiter = fixed_line.find(delimiter, current_pos)
             
+            if next_qualifier != -1 and (next_delimiter == -1 or next_qualifier <= next_delimiter):
+                # Start of quoted field (a qualifier wins a tie with a delimiter)
+                in_quoted_field = True
+                current_pos = next_qualifier + qualifier_length
+            elif next_delimiter != -1:
+                # Found a delimiter outside quoted field - new column
+                column_count += 1
+                current_pos = next_delimiter + delimiter_length
+            else:
+                # Only regular characters remain
+                break
+            if checkpoints is not None:
+                checkpoints.append((current_pos, column_count, in_quoted_field))
+    
     return column_count
 
+class ColumnCounter:
+    """
+    count_columns for a line that is rebuilt with new endings, as in the
+    multi-line combine loop. The scan state is saved at field boundaries, so
+    a line sharing a prefix with the previously counted one is only scanned
+    from the last boundary inside that shared prefix.
+    """
+    
+    def __init__(self, delimiter, qualifier):
+        self.delimiter = delimiter
+        self.qualifier = qualifier
+        self._line = None
+        self._fixed_line = ''
+        self._column_count = 1
+        self._checkpoints = [(0, 1, False)]
+        # A qualifier made of whitespace can stretch the lookahead of a
+        # closing quote arbitrarily far, so always rescan in that case
+        self._resumable = not any(char.isspace() for char in qualifier)
+    
+    def count(self, line):
+        if line == self._line:
+            return self._column_count
+        
+        fixed_line = fix_embedded_quotes(line, self.delimiter, self.qualifier)
+        
+        # Drop the saved states whose position plus lookahead is not in the
+        # prefix the new line shares with the previous one
+        lookahead = len(self.delimiter) + len(self.qualifier)
+        checkpoints = self._checkpoints
+        if not self._resumable:
+            del checkpoints[1:]
+        while len(checkpoints) > 1:
+            limit = checkpoints[-1][0] + lookahead
+            if limit <= len(self._fixed_line) and fixed_line.startswith(self._fixed_line[:limit]):
+                break
+            checkpoints.pop()
+        
+        current_pos, column_count, in_quoted_field = checkpoints[-1]
+        self._column_count = scan_columns(fixed_line, self.delimiter, self.qualifier,
+                                          current_pos, column_count, in_quoted_field,
+                                          checkpoints)
+        self._line = line
+        self._fixed_line = fixed_line
+        return self._column_count
+
 def is_line_complete(line, delimiter, qualifier):
     """
     Enhanced function to check if a line has complete quoted fields.
     Returns True if all quotes are balanced, False otherwise.
     """
+    closing_quote = closing_qualifier_pattern(delimiter, qualifier)
+    single_char_qualifier = len(qualifier) == 1
+    qualifier_length = len(qualifier)
+    line_length = len(line)
     in_quote = False
     current_pos = 0
     
-    while current_pos < len(line):
-        if line[current_pos:current_pos+len(qualifier)] == qualifier:
-            if not in_quote:
-                # Start of quoted field
-                in_quote = True
-                current_pos += len(qualifier)
-            else:
-                # Potential end of quoted field
-                next_pos = current_pos + len(qualifier)
-                
-                # Skip whitespace
-                while next_pos < len(line) and line[next_pos].isspace():
-                    next_pos += 1
-                
-                # If we're at end of line or next char is delimiter, this is a closing quote
-                if next_pos >= len(line) or line[next_pos:next_pos+len(delimiter)] == delimiter:
-                    in_quote = False
-                # Otherwise it's just an embedded quote
-                current_pos += len(qualifier)
+    # Only qualifiers change the state, so jump straight from one to the next
+    while current_pos < line_length:
+        if in_quote and single_char_qualifier:
+            # Skip embedded quotes and go straight to the closing quote
+            field_end = closing_quote.search(line, current_pos)
+            if not field_end:
+                break
+            in_quote = False
+            current_pos = field_end.start() + qualifier_length
+            continue
+        
+        qualifier_pos = line.find(qualifier, current_pos)
+        if qualifier_pos == -1:
+            break
+        
+        if not in_quote:
+            # Start of quoted field
+            in_quote = True
         else:
-            current_pos += 1
+            # If only whitespace stands between it and the delimiter or the
+            # end of line, this is a closing quote
+            if closing_quote.match(line, qualifier_pos):
+                in_quote = False
+            # Otherwise it's just an embedded quote
+        current_pos = qualifier_pos + qualifier_length
     
     return not in_quote
 
-def should_combine_lines(current_line, next_line, delimiter, qualifier):
+def should_combine_lines(current_line, next_line, delimiter, qualifier, current_columns=None):
     """
     Enhanced logic to determine if two lines should be combined.
     This handles cases where the first line ends with an incomplete quoted field.
+    
+    current_columns may be passed in when the caller has already counted the
+    columns of current_line, so the line is not scanned again.
     """
     # Check if current line ends with an incomplete quoted field
     current_ends_with_quote = current_line.rstrip().endswith(qualifier)
@@ -273,13 +738,14 @@ def should_combine_lines(current_line, next_line, delimiter, qualifier):
     # Check if next line starts with content that could be part of a quoted field
     next_starts_with_content = next_line.strip() and not next_line.strip().startswith(qualifier)
     
-    # Check if current line has fewer columns than expected (indicating incomplete transaction)
-    current_columns = count_columns(current_line, delimiter, qualifier)
-    
     # If current line ends with a quote and next line has content, likely should combine
     if current_ends_with_quote and next_starts_with_content:
         return True
     
+    # Check if current line has fewer columns than expected (indicating incomplete transaction)
+    if current_columns is None:
+        current_columns = count_columns(current_line, delimiter, qualifier)
+    
     # If current line has very few columns, it's likely incomplete
     if current_columns < 10:  # Arbitrary threshold - adjust as needed
         return True
@@ -311,7 +777,8 @@ def fix_data_shifting(input_path, output_path, error_path=None, error_transactio
         qualifier (str, optional): Text qualifier (default: auto-detected or '"')
     
     Returns:
-        None: Writes output files to specified paths
+        ProcessingResult: Flags telling whether the error log and the error
+        transactions file were written, so callers need not stat for them
     
     Raises:
         FileNotFoundError: If input file doesn't exist
@@ -343,33 +810,33 @@ def fix_data_shifting(input_path, output_path, error_path=None, error_transactio
     # Initialize error log list and error transactions
     error_logs = []
     error_transactions = []
+    result = ProcessingResult()
     
+    # Stream the input rather than reading it into a list. The encoding is
+    # settled up front (latin-1 if utf-8 fails anywhere in the file) so a
+    # late decoding error cannot turn up after output has been written.
+    encoding = detect_file_encoding(input_path)
+    raw_lines = read_lines(input_path, encoding)
     try:
-        with open(input_path, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-    except UnicodeDecodeError:
-        # Try with a different encoding if utf-8 fails
-        try:
-            with open(input_path, 'r', encoding='latin-1') as file:
-                lines = file.readlines()
-        except Exception as e:
-            error_msg = f"Error reading input file: {str(e)}"
-            print(error_msg)
-            error_logs.append(error_msg)
-            if error_path:
-                write_error_log(error_path, error_logs)
-            return
+        first_line = next(raw_lines, None)
+    except Exception as e:
+        error_msg = f"Error reading input file: {str(e)}"
+        print(error_msg)
+        error_logs.append(error_msg)
+        if error_path:
+            result.error_log_written = write_error_log(error_path, error_logs)
+        return result
     
-    if not lines:
+    if first_line is None:
         error_msg = "Input file is empty."
         print(error_msg)
         error_logs.append(error_msg)
         if error_path:
-            write_error_log(error_path, error_logs)
-        return
+            result.error_log_written = write_error_log(error_path, error_logs)
+        return result
     
     # Strip newlines from the header line
-    header_line = lines[0].strip()
+    header_line = first_line.strip()
     
     # Add header to error transactions
     if error_transactions_path:
@@ -387,161 +854,177 @@ def fix_data_shifting(input_path, output_path, error_path=None, error_transactio
     header_count = count_columns(header_line, delimiter, qualifier)
     print(f"Detected {header_count} columns in header")
     
-    # Process the data lines
-    corrected_lines = [header_line]
+    # Every line's column count and cleaned form are needed, and they do not
+    # depend on each other, so on large files they are worked out across
+    # processes ahead of the main loop
+    workers = PARALLEL_WORKERS
+    if workers > 1 and os.path.getsize(input_path) >= PARALLEL_MIN_FILE_SIZE:
+        data_lines = analyze_lines_in_parallel(raw_lines, delimiter, qualifier, workers)
+    else:
+        data_lines = zip(raw_lines, itertools.repeat(None))
+    lines = LookaheadLines(itertools.chain([(first_line, None)], data_lines))
+    
+    # Process the data lines, writing each one out as soon as it is decided
+    corrected_lines = CorrectedLineWriter(output_path, delimiter, qualifier)
+    corrected_lines.write(header_line)
     uncorrectable_lines = []
     i = 1
     
-    while i < len(lines):
-        current_line = lines[i].rstrip('\r\n')
+    try:
+        while lines.has(i):
+            lines.release(i)
+            current_line = lines[i]
         
-        # Skip empty lines
-        if not current_line.strip():
-            i += 1
-            continue
+            # Skip empty lines
+            if not current_line.strip():
+                i += 1
+                continue
         
-        # Count columns in the current line
-        column_count = count_columns(current_line, delimiter, qualifier)
+            # Count columns in the current line, and clean it in the same go in
+            # case it is written out as it is
+            analysis = lines.analysis(i)
+            if analysis is None:
+                analysis = analyze_line(current_line, delimiter, qualifier)
+            column_count, cleaned_line = analysis
         
-        # If the column count matches header count, add the line as is
-        if column_count == header_count:
-            corrected_lines.append(current_line)
-            i += 1
-        else:
-            # Enhanced multi-line detection using multiple strategies
-            line_complete = is_line_complete(current_line, delimiter, qualifier)
-            should_combine = False
+            # If the column count matches header count, add the line as is
+            if column_count == header_count:
+                corrected_lines.write(current_line, cleaned_line)
+                i += 1
+            else:
+                # Enhanced multi-line detection using multiple strategies
+                line_complete = is_line_complete(current_line, delimiter, qualifier)
+                should_combine = False
             
-            # Check if we should combine with next line
-            if i + 1 < len(lines):
-                next_line = lines[i + 1].rstrip('\r\n')
-                should_combine = should_combine_lines(current_line, next_line, delimiter, qualifier)
+                # Check if we should combine with next line
+                if lines.has(i + 1):
+                    next_line = lines[i + 1]
+                    should_combine = should_combine_lines(current_line, next_line, delimiter, qualifier,
+                                                          column_count)
             
-            if (not line_complete or should_combine) and i + 1 < len(lines):
-                # Start building a combined line
-                combined_line = current_line
-                next_index = i + 1
-                original_lines = [f"Line {i+1}: {current_line}"]
-                error_transaction_lines = [current_line]
+                if (not line_complete or should_combine) and lines.has(i + 1):
+                    # Start building a combined line; its column count is kept
+                    # up to date incrementally as lines are appended
+                    combined_line = current_line
+                    combined_count = column_count
+                    combined_counter = ColumnCounter(delimiter, qualifier)
+                    next_index = i + 1
+                    original_lines = [f"Line {i+1}: {current_line}"]
+                    error_transaction_lines = [current_line]
                 
-                # Continue adding lines until we have matching column count or no more lines
-                # Increased limit for very long descriptions (like medical equipment)
-                max_combine_attempts = 25  # Increased from 10 to handle edge cases
-                combine_attempts = 0
+                    # Continue adding lines until we have matching column count or no more lines
+                    # Increased limit for very long descriptions (like medical equipment)
+                    max_combine_attempts = 25  # Increased from 10 to handle edge cases
+                    combine_attempts = 0
                 
-                while (next_index < len(lines) and 
-                       count_columns(combined_line, delimiter, qualifier) != header_count and
-                       combine_attempts < max_combine_attempts):
+                    while (lines.has(next_index) and 
+                           combined_count != header_count and
+                           combine_attempts < max_combine_attempts):
                     
-                    next_line = lines[next_index].rstrip('\r\n')
-                    original_lines.append(f"Line {next_index+1}: {next_line}")
-                    error_transaction_lines.append(next_line)
+                        next_line = lines[next_index]
+                        original_lines.append(f"Line {next_index+1}: {next_line}")
+                        error_transaction_lines.append(next_line)
                     
-                    # Replace newline with space for readability
-                    combined_line += ' ' + next_line
+                        # Replace newline with space for readability
+                        combined_line += ' ' + next_line
                     
-                    # Check if we now have all columns
-                    if count_columns(combined_line, delimiter, qualifier) == header_count:
-                        break
+                        # Check if we now have all columns
+                        combined_count = combined_counter.count(combined_line)
+                        if combined_count == header_count:
+                            break
                     
-                    next_index += 1
-                    combine_attempts += 1
+                        next_index += 1
+                        combine_attempts += 1
                 
-                # If we now have the correct count, consider it fixed
-                if count_columns(combined_line, delimiter, qualifier) == header_count:
-                    corrected_lines.append(combined_line)
-                    error_logs.append(f"Fixed multi-line transaction at lines {i+1}-{next_index+1}:")
-                    error_logs.extend(original_lines)
-                    error_logs.append(f"Combined into: {combined_line}")
-                    error_logs.append("-" * 50)
-                else:
-                    # Enhanced logic: Check if we're very close to completion
-                    current_columns = count_columns(combined_line, delimiter, qualifier)
-                    if current_columns >= header_count * 0.8:  # If we have at least 80% of expected columns
-                        # Try to complete the transaction by looking for the closing pattern
-                        if combined_line.rstrip().endswith(qualifier):
-                            # We have an incomplete quoted field, try to find the rest
-                            remaining_lines = []
-                            search_index = next_index
-                            search_attempts = 0
-                            max_search = 10  # Additional search limit
+                    # If we now have the correct count, consider it fixed
+                    if combined_count == header_count:
+                        corrected_lines.write(combined_line)
+                        error_logs.append(f"Fixed multi-line transaction at lines {i+1}-{next_index+1}:")
+                        error_logs.extend(original_lines)
+                        error_logs.append(f"Combined into: {combined_line}")
+                        error_logs.append("-" * 50)
+                    else:
+                        # Enhanced logic: Check if we're very close to completion
+                        current_columns = combined_count
+                        if current_columns >= header_count * 0.8:  # If we have at least 80% of expected columns
+                            # Try to complete the transaction by looking for the closing pattern
+                            if combined_line.rstrip().endswith(qualifier):
+                                # We have an incomplete quoted field, try to find the rest
+                                remaining_lines = []
+                                search_index = next_index
+                                search_attempts = 0
+                                max_search = 10  # Additional search limit
                             
-                            while (search_index < len(lines) and 
-                                   search_attempts < max_search and
-                                   count_columns(combined_line, delimiter, qualifier) != header_count):
+                                while (lines.has(search_index) and 
+                                       search_attempts < max_search and
+                                       combined_count != header_count):
                                 
-                                search_line = lines[search_index].rstrip('\r\n')
-                                remaining_lines.append(f"Line {search_index+1}: {search_line}")
+                                    search_line = lines[search_index]
+                                    remaining_lines.append(f"Line {search_index+1}: {search_line}")
                                 
-                                # Check if this line completes the transaction
-                                test_combined = combined_line + ' ' + search_line
-                                if count_columns(test_combined, delimiter, qualifier) == header_count:
-                                    # Found completion!
-                                    combined_line = test_combined
-                                    next_index = search_index
-                                    original_lines.extend(remaining_lines)
-                                    error_transaction_lines.extend([search_line])
-                                    break
+                                    # Check if this line completes the transaction
+                                    test_combined = combined_line + ' ' + search_line
+                                    test_count = combined_counter.count(test_combined)
+                                    if test_count == header_count:
+                                        # Found completion!
+                                        combined_line = test_combined
+                                        combined_count = test_count
+                                        next_index = search_index
+                                        original_lines.extend(remaining_lines)
+                                        error_transaction_lines.extend([search_line])
+                                        break
                                 
-                                search_index += 1
-                                search_attempts += 1
+                                    search_index += 1
+                                    search_attempts += 1
                             
-                            # If we found completion, add it
-                            if count_columns(combined_line, delimiter, qualifier) == header_count:
-                                corrected_lines.append(combined_line)
-                                error_logs.append(f"Fixed extended multi-line transaction at lines {i+1}-{next_index+1}:")
-                                error_logs.extend(original_lines)
-                                error_logs.append(f"Combined into: {combined_line}")
-                                error_logs.append("-" * 50)
-                                i = next_index + 1
-                                continue
+                                # If we found completion, add it
+                                if combined_count == header_count:
+                                    corrected_lines.write(combined_line)
+                                    error_logs.append(f"Fixed extended multi-line transaction at lines {i+1}-{next_index+1}:")
+                                    error_logs.extend(original_lines)
+                                    error_logs.append(f"Combined into: {combined_line}")
+                                    error_logs.append("-" * 50)
+                                    i = next_index + 1
+                                    continue
+                    
+                        # If we still couldn't fix it, log the error
+                        error_msg = f"Error: Could not fix multi-line transaction starting at line {i+1} (has {current_columns} columns, expected {header_count})"
+                        print(error_msg)
+                        error_logs.append(error_msg)
+                        error_logs.extend(original_lines)
+                        error_logs.append("-" * 50)
+                        uncorrectable_lines.append((i+1, current_line))
+                        corrected_lines.write(current_line, cleaned_line)  # Add as-is, since we can't fix it
                     
-                    # If we still couldn't fix it, log the error
-                    error_msg = f"Error: Could not fix multi-line transaction starting at line {i+1} (has {current_columns} columns, expected {header_count})"
+                        # Add to error transactions file
+                        error_transactions.extend(error_transaction_lines)
+                
+                    i = next_index + 1
+                else:
+                    # Single line with incorrect columns that can't be fixed
+                    error_msg = f"Error: Line {i+1} has {column_count} columns (expected {header_count})"
                     print(error_msg)
                     error_logs.append(error_msg)
-                    error_logs.extend(original_lines)
+                    error_logs.append(f"Line {i+1}: {current_line}")
                     error_logs.append("-" * 50)
                     uncorrectable_lines.append((i+1, current_line))
-                    corrected_lines.append(current_line)  # Add as-is, since we can't fix it
-                    
-                    # Add to error transactions file
-                    error_transactions.extend(error_transaction_lines)
-                
-                i = next_index + 1
-            else:
-                # Single line with incorrect columns that can't be fixed
-                error_msg = f"Error: Line {i+1} has {column_count} columns (expected {header_count})"
-                print(error_msg)
-                error_logs.append(error_msg)
-                error_logs.append(f"Line {i+1}: {current_line}")
-                error_logs.append("-" * 50)
-                uncorrectable_lines.append((i+1, current_line))
-                corrected_lines.append(current_line)  # Add as-is
+                    corrected_lines.write(current_line, cleaned_line)  # Add as-is
                 
-                # Add to error transactions file
-                error_transactions.append(current_line)
+                    # Add to error transactions file
+                    error_transactions.append(current_line)
                 
-                i += 1
+                    i += 1
     
-    # Clean the content of each line (handle newlines within quoted text)
-    final_lines = []
-    for line in corrected_lines:
-        # Process the line to fix any issues with newlines in quoted fields
-        cleaned_line = clean_qualified_content(line, delimiter, qualifier)
-        final_lines.append(cleaned_line)
+    except BaseException:
+        # Do not leave a partial corrected file behind
+        corrected_lines.discard()
+        raise
     
-    # Write the corrected data to the output file
+    # Finish writing the corrected data to the output file
     try:
-        with open(output_path, 'w', encoding='utf-8') as out_file:
-            for i, line in enumerate(final_lines):
-                # Add newline character except for the last line
-                if i < len(final_lines) - 1:
-                    out_file.write(line + '\n')
-                else:
-                    out_file.write(line)
+        corrected_lines.close()
         
-        print(f"Processed {len(lines)} input lines into {len(final_lines)} corrected lines")
+        print(f"Processed {lines.count} input lines into {corrected_lines.lines_written} corrected lines")
         print(f"Corrected data written to {output_path}")
         
         if uncorrectable_lines:
@@ -549,12 +1032,12 @@ def fix_data_shifting(input_path, output_path, error_path=None, error_transactio
         
         # Write error log if there are any errors and an error path is provided
         if error_logs and error_path:
-            write_error_log(error_path, error_logs)
+            result.error_log_written = write_error_log(error_path, error_logs)
             print(f"Error log written to {error_path}")
             
         # Write error transactions if there are any and path is provided
         if len(error_transactions) > 1 and error_transactions_path:  # > 1 because header is always included
-            write_error_transactions(error_transactions_path, error_transactions)
+            result.error_transactions_written = write_error_transactions(error_transactions_path, error_transactions)
             print(f"Error transactions written to {error_transactions_path}")
             
     except Exception as e:
@@ -562,7 +1045,9 @@ def fix_data_shifting(input_path, output_path, error_path=None, error_transactio
         print(error_msg)
         error_logs.append(error_msg)
         if error_path:
-            write_error_log(error_path, error_logs)
+            result.error_log_written = write_error_log(error_path, error_logs)
+    
+    return result
 
 def clean_qualified_content(line, delimiter, qualifier):
     """
@@ -571,109 +1056,147 @@ def clean_qualified_content(line, delimiter, qualifier):
     # Apply special fix for embedded quotes like inches marks
     fixed_line = fix_embedded_quotes(line, delimiter, qualifier)
     
+    return clean_fixed_line(fixed_line, delimiter, qualifier)
+
+def clean_fixed_line(fixed_line, delimiter, qualifier):
+    """
+    Clean a line already passed through fix_embedded_quotes (see
+    clean_qualified_content).
+    """
+    closing_quote = closing_qualifier_pattern(delimiter, qualifier)
+    # Output is collected as a list of pieces and joined once at the end;
+    # text outside quotes goes straight into it, quoted text is gathered per
+    # field so it can be processed when the field closes
     cleaned_parts = []
+    field_content = []
     current_pos = 0
     in_quote = False
-    current_field = ""
-    field_content = ""
+    # Delimiters cannot overlap qualifiers (see count_columns)
+    plain_delimiter = set(delimiter).isdisjoint(qualifier)
+    # Embedded one-character qualifiers can be copied along with the text
+    # around them unless the newline replacement would change them
+    skip_embedded = len(qualifier) == 1 and qualifier not in '\r\n'
+    line_length = len(fixed_line)
+    qualifier_length = len(qualifier)
+    delimiter_length = len(delimiter)
+    next_qualifier = fixed_line.find(qualifier)
+    next_delimiter = fixed_line.find(delimiter)
     
-    while current_pos < len(fixed_line):
-        if fixed_line[current_pos:current_pos+len(qualifier)] == qualifier:
-            if not in_quote:
-                # Starting a quoted field
-                in_quote = True
-                current_field += qualifier
-                field_content = ""  # Reset field content for new field
-                current_pos += len(qualifier)
+    while current_pos < line_length:
+        if in_quote:
+            if skip_embedded:
+                # Embedded quotes stay in the content, so copy everything up
+                # to the closing quote in one slice
+                field_end = closing_quote.search(fixed_line, current_pos)
+                if not field_end:
+                    # An unclosed field's content is dropped
+                    break
+                qualifier_pos = field_end.start()
             else:
-                # Check if this is a real end quote or just an embedded quote
-                next_pos = current_pos + len(qualifier)
+                # Copy the quoted body up to the next qualifier in one slice
+                qualifier_pos = fixed_line.find(qualifier, current_pos)
+                if qualifier_pos == -1:
+                    # An unclosed field's content is dropped
+                    break
+            # Replace newlines and tabs in quoted text with spaces
+            field_content.append(fixed_line[current_pos:qualifier_pos].translate(_QUOTED_WHITESPACE))
+            current_pos = qualifier_pos
+            
+            # Check if this is a real end quote or just an embedded quote:
+            # at end of line or before a delimiter, this is a closing quote
+            if not skip_embedded:
+                field_end = closing_quote.match(fixed_line, current_pos)
+            if field_end:
+                # End of quoted field - now process the field content before adding it
                 
-                # Skip whitespace
-                while next_pos < len(fixed_line) and fixed_line[next_pos].isspace():
-                    next_pos += 1
+                # Process the field content:
+                # 1. Replace tabs with spaces
+                processed_content = ''.join(field_content).replace('\t', ' ')
                 
-                # If we're at end of line or next char is delimiter, this is a closing quote
-                if next_pos >= len(fixed_line) or fixed_line[next_pos:next_pos+len(delimiter)] == delimiter:
-                    # End of quoted field - now process the field content before adding it
-                    
-                    # Process the field content:
-                    # 1. Replace tabs with spaces
-                    processed_content = field_content.replace('\t', ' ')
-                    
-                    # 2. Replace newlines with spaces (already handled in the character-by-character processing)
-                    
-                    # 3. Trim multiple consecutive spaces to a single space
-                    processed_content = re.sub(r' +', ' ', processed_content)
-                    
-                    # Add the processed content and closing qualifier
-                    current_field += processed_content + qualifier
-                    
-                    # End of quoted field
-                    in_quote = False
-                    current_pos = next_pos
-                    
-                    # If there's a delimiter here, add it
-                    if next_pos < len(fixed_line) and fixed_line[next_pos:next_pos+len(delimiter)] == delimiter:
-                        cleaned_parts.append(current_field)
-                        current_field = ""
-                        cleaned_parts.append(delimiter)
-                        current_pos += len(delimiter)
-                    else:
-                        # End of line after quote
-                        cleaned_parts.append(current_field)
-                        current_field = ""
-                else:
-                    # This is an embedded quote, not a closing quote
-                    field_content += qualifier  # Add the embedded quote to field content
-                    current_pos += len(qualifier)
-        elif not in_quote and fixed_line[current_pos:current_pos+len(delimiter)] == delimiter:
-            # Delimiter outside quotes
-            if current_field:
-                cleaned_parts.append(current_field)
-                current_field = ""
-            cleaned_parts.append(delimiter)
-            current_pos += len(delimiter)
+                # 2. Replace newlines with spaces (already handled when the body was copied)
+                
+                # 3. Trim multiple consecutive spaces to a single space
+                if '  ' in processed_content:
+                    processed_content = _MULTIPLE_SPACES.sub(' ', processed_content)
+                
+                # Add the processed content and closing qualifier
+                cleaned_parts.append(processed_content)
+                cleaned_parts.append(qualifier)
+                
+                # End of quoted field (whitespace after the quote is dropped)
+                in_quote = False
+                current_pos = field_end.end()
+                
+                # If there's a delimiter here, add it
+                if field_end.group(2) is not None:
+                    cleaned_parts.append(delimiter)
+            else:
+                # This is an embedded quote, not a closing quote
+                field_content.append(qualifier)  # Add the embedded quote to field content
+                current_pos += qualifier_length
+        elif plain_delimiter:
+            # Outside quotes, text and delimiters up to the next qualifier are
+            # added as is, in one slice
+            qualifier_pos = fixed_line.find(qualifier, current_pos)
+            if qualifier_pos == -1:
+                cleaned_parts.append(fixed_line[current_pos:])
+                break
+            cleaned_parts.append(fixed_line[current_pos:qualifier_pos])
+            
+            # Starting a quoted field
+            in_quote = True
+            cleaned_parts.append(qualifier)
+            field_content = []  # Reset field content for new field
+            current_pos = qualifier_pos + qualifier_length
         else:
-            # Regular character
-            if in_quote:
-                if fixed_line[current_pos] == '\n' or fixed_line[current_pos] == '\r':
-                    # Replace newlines in quoted text with space
-                    field_content += ' '
-                elif fixed_line[current_pos] == '\t':
-                    # Replace tabs in quoted text with space (will be further processed at end)
-                    field_content += ' '
-                else:
-                    # Add regular character to field content
-                    field_content += fixed_line[current_pos]
+            # Refresh the cached positions only once they fall behind
+            if 0 <= next_qualifier < current_pos:
+                next_qualifier = fixed_line.find(qualifier, current_pos)
+            if 0 <= next_delimiter < current_pos:
+                next_delimiter = fixed_line.find(delimiter, current_pos)
+            
+            if next_qualifier != -1 and (next_delimiter == -1 or next_qualifier <= next_delimiter):
+                # Outside quotes, add the text before the qualifier as is
+                cleaned_parts.append(fixed_line[current_pos:next_qualifier])
+                # Starting a quoted field
+                in_quote = True
+                cleaned_parts.append(qualifier)
+                field_content = []  # Reset field content for new field
+                current_pos = next_qualifier + qualifier_length
+            elif next_delimiter != -1:
+                # Outside quotes, add the text before the delimiter as is
+                cleaned_parts.append(fixed_line[current_pos:next_delimiter])
+                # Delimiter outside quotes
+                cleaned_parts.append(delimiter)
+                current_pos = next_delimiter + delimiter_length
             else:
-                # Outside quotes, add as is
-                current_field += fixed_line[current_pos]
-            current_pos += 1
-    
-    # Add any remaining field content
-    if current_field:
-        cleaned_parts.append(current_field)
+                # Only regular characters remain
+                cleaned_parts.append(fixed_line[current_pos:])
+                break
     
     return ''.join(cleaned_parts)
 
 def write_error_log(error_path, error_logs):
-    """Write error logs to the specified file."""
+    """Write error logs to the specified file. Returns True if the file was written."""
     try:
         with open(error_path, 'w', encoding='utf-8') as error_file:
             for error in error_logs:
                 error_file.write(error + '\n')
+        return True
     except Exception as e:
         print(f"Error writing error log: {e}")
+        return False
 
 def write_error_transactions(error_transactions_path, error_transactions):
-    """Write error transactions to the specified file."""
+    """Write error transactions to the specified file. Returns True if the file was written."""
     try:
         with open(error_transactions_path, 'w', encoding='utf-8') as error_file:
             for transaction in error_transactions:
                 error_file.write(transaction + '\n')
+        return True
     except Exception as e:
         print(f"Error writing error transactions: {e}")
+        return False
 
 def show_help():
     """Display comprehensive help information about the data shifting module."""
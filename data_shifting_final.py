@@ -87,7 +87,7 @@ def fix_embedded_quotes(line, delimiter, qualifier):
             prev_delim_pos += len(delimiter)
             
         # Check if there's a qualifier after the previous delimiter
-        if result[prev_delim_pos:prev_delim_pos+len(qualifier)] == qualifier:
+        if result.startswith(qualifier, prev_delim_pos):
             # There's a qualifier, so we have a proper field
             field_start = prev_delim_pos + len(qualifier)
             
@@ -140,7 +140,7 @@ def count_columns(line, delimiter, qualifier):
     
     while current_pos < len(fixed_line):
         # Check for qualifier
-        if fixed_line[current_pos:current_pos+len(qualifier)] == qualifier:
+        if fixed_line.startswith(qualifier, current_pos):
             if not in_quoted_field:
                 # Start of quoted field
                 in_quoted_field = True
@@ -155,19 +155,19 @@ def count_columns(line, delimiter, qualifier):
                     next_pos += 1
                 
                 # Check if followed by delimiter or end of line
-                if next_pos >= len(fixed_line) or fixed_line[next_pos:next_pos+len(delimiter)] == delimiter:
+                if next_pos >= len(fixed_line) or fixed_line.startswith(delimiter, next_pos):
                     # This is indeed the end of the quoted field
                     in_quoted_field = False
                     current_pos = next_pos
                     
                     # If not at the end, then we've found a new column
-                    if next_pos < len(fixed_line) and fixed_line[next_pos:next_pos+len(delimiter)] == delimiter:
+                    if next_pos < len(fixed_line) and fixed_line.startswith(delimiter, next_pos):
                         column_count += 1
                         current_pos += len(delimiter)
                 else:
                     # This is an embedded quote, not a closing quote
                     current_pos += len(qualifier)
-        elif not in_quoted_field and fixed_line[current_pos:current_pos+len(delimiter)] == delimiter:
+        elif not in_quoted_field and fixed_line.startswith(delimiter, current_pos):
             # Found a delimiter outside quoted field - new column
             column_count += 1
             current_pos += len(delimiter)
@@ -186,7 +186,7 @@ def is_line_complete(line, delimiter, qualifier):
     current_pos = 0
     
     while current_pos < len(line):
-        if line[current_pos:current_pos+len(qualifier)] == qualifier:
+        if line.startswith(qualifier, current_pos):
             if not in_quote:
                 # Start of quoted field
                 in_quote = True
@@ -200,7 +200,7 @@ def is_line_complete(line, delimiter, qualifier):
                     next_pos += 1
                 
                 # If we're at end of line or next char is delimiter, this is a closing quote
-                if next_pos >= len(line) or line[next_pos:next_pos+len(delimiter)] == delimiter:
+                if next_pos >= len(line) or line.startswith(delimiter, next_pos):
                     in_quote = False
                 # Otherwise it's just an embedded quote
                 current_pos += len(qualifier)
@@ -433,7 +433,7 @@ def clean_qualified_content(line, delimiter, qualifier):
     field_content = ""
     
     while current_pos < len(fixed_line):
-        if fixed_line[current_pos:current_pos+len(qualifier)] == qualifier:
+        if fixed_line.startswith(qualifier, current_pos):
             if not in_quote:
                 # Starting a quoted field
                 in_quote = True
@@ -449,7 +449,7 @@ def clean_qualified_content(line, delimiter, qualifier):
                     next_pos += 1
                 
                 # If we're at end of line or next char is delimiter, this is a closing quote
-                if next_pos >= len(fixed_line) or fixed_line[next_pos:next_pos+len(delimiter)] == delimiter:
+                if next_pos >= len(fixed_line) or fixed_line.startswith(delimiter, next_pos):
                     # End of quoted field - now process the field content before adding it
                     
                     # Process the field content:
@@ -469,7 +469,7 @@ def clean_qualified_content(line, delimiter, qualifier):
                     current_pos = next_pos
                     
                     # If there's a delimiter here, add it
-                    if next_pos < len(fixed_line) and fixed_line[next_pos:next_pos+len(delimiter)] == delimiter:
+                    if next_pos < len(fixed_line) and fixed_line.startswith(delimiter, next_pos):
                         cleaned_parts.append(current_field)
                         current_field = ""
                         cleaned_parts.append(delimiter)
@@ -482,7 +482,7 @@ def clean_qualified_content(line, delimiter, qualifier):
                     # This is an embedded quote, not a closing quote
                     field_content += qualifier  # Add the embedded quote to field content
                     current_pos += len(qualifier)
-        elif not in_quote and fixed_line[current_pos:current_pos+len(delimiter)] == delimiter:
+        elif not in_quote and fixed_line.startswith(delimiter, current_pos):
             # Delimiter outside quotes
             if current_field:
                 cleaned_parts.append(current_field)
@@ -13,6 +13,7 @@ worker_class = "sync"
 worker_connections = 1000
 timeout = 30
 keepalive = 2
+sendfile = True  # Serve downloads via wsgi.file_wrapper -> sendfile(2)
 
 # Restart workers after this many requests
 max_requests = 1000
@@ -1,4 +1,5 @@
-from data_shifting import count_columns, clean_qualified_content
+import re
+from data_shifting import count_columns, analyze_line
 
 # Test our solution directly with detailed output
 
@@ -7,19 +8,15 @@ delimiter = '|^|'
 qualifier = '"'
 
 # Test cases
-splash_case = '"1"|^|"ADB will apply SSL Certificates for WGU Complio "Splash pages""|^|"Paid"'
-inches_case = '"2"|^|"CAP-GOWN PKG ULTRA NAVY 57""|^|"Paid"'
+from test_fixtures import splash_case, inches_case
 
 def analyze_string(description, test_string):
     print(f"\n--- {description} ---")
     print(f"Input: {test_string}")
     
-    # Count columns
-    columns = count_columns(test_string, delimiter, qualifier)
+    # Count columns and clean content from a single parse of the string
+    columns, cleaned = analyze_line(test_string, delimiter, qualifier)
     print(f"Column count: {columns}")
-    
-    # Clean content
-    cleaned = clean_qualified_content(test_string, delimiter, qualifier)
     print(f"Cleaned: {cleaned}")
     
     # Verify column count in cleaned string
@@ -39,49 +36,73 @@ def analyze_string(description, test_string):
 analyze_string("Splash Pages Case", splash_case)
 analyze_string("Inches Symbol Case", inches_case)
 
+# Whitespace between a closing quote and the delimiter; \s matches the same
+# characters as str.isspace, which the parser uses
+whitespace_run = re.compile(r'\s*')
+
 # For deeper debugging, trace through character by character
 def trace_processing(description, test_string):
-    print(f"\n--- Character-by-Character Tracing for {description} ---")
+    # Trace lines are collected and printed together at the end
+    trace = [f"\n--- Character-by-Character Tracing for {description} ---"]
     in_quote = False
     position = 0
+    # The lengths do not change while tracing, so look them up once
+    string_length = len(test_string)
+    qualifier_length = len(qualifier)
+    delimiter_length = len(delimiter)
     
-    while position < len(test_string):
+    def context_with_marker(position):
+        # Up to 10 characters before the marked one and 9 after it, sliced
+        # straight from the string
         char = test_string[position]
-        context = test_string[max(0, position-10):min(len(test_string), position+10)]
-        context_with_marker = f"{context[:min(10, position)]}[{char}]{context[min(10, position)+1:]}"
+        return f"{test_string[max(0, position-10):position]}[{char}]{test_string[position+1:position+10]}"
+    
+    while position < string_length:
+        # Jump to the next qualifier, or delimiter outside quotes; everything
+        # before it is regular characters, traced in one batch
+        next_position = test_string.find(qualifier, position)
+        if next_position == -1:
+            next_position = string_length
+        if not in_quote:
+            delimiter_position = test_string.find(delimiter, position, next_position + delimiter_length - 1)
+            if delimiter_position != -1:
+                next_position = delimiter_position
+        
+        if next_position > position:
+            where = "inside" if in_quote else "outside"
+            trace.extend(
+                f"Position {regular}: Regular character {where} quotes: ...{context_with_marker(regular)}..."
+                for regular in range(position, next_position)
+            )
+            position = next_position
+            continue
         
         # Check for qualifier
-        if test_string[position:position+len(qualifier)] == qualifier:
+        if test_string.startswith(qualifier, position):
             if not in_quote:
-                print(f"Position {position}: Found opening qualifier at: ...{context_with_marker}...")
+                trace.append(f"Position {position}: Found opening qualifier at: ...{context_with_marker(position)}...")
                 in_quote = True
-                position += len(qualifier)
+                position += qualifier_length
             else:
                 # Check if this is an end quote
-                next_pos = position + len(qualifier)
-                while next_pos < len(test_string) and test_string[next_pos].isspace():
-                    next_pos += 1
+                next_pos = whitespace_run.match(test_string, position + qualifier_length).end()
                 
-                if next_pos >= len(test_string) or test_string[next_pos:next_pos+len(delimiter)] == delimiter:
-                    print(f"Position {position}: Found closing qualifier at: ...{context_with_marker}...")
+                if next_pos >= string_length or test_string.startswith(delimiter, next_pos):
+                    trace.append(f"Position {position}: Found closing qualifier at: ...{context_with_marker(position)}...")
                     in_quote = False
                     position = next_pos
                     
-                    if next_pos < len(test_string) and test_string[next_pos:next_pos+len(delimiter)] == delimiter:
-                        print(f"Position {next_pos}: Found delimiter after closing qualifier")
-                        position += len(delimiter)
+                    if next_pos < string_length and test_string.startswith(delimiter, next_pos):
+                        trace.append(f"Position {next_pos}: Found delimiter after closing qualifier")
+                        position += delimiter_length
                 else:
-                    print(f"Position {position}: Found embedded qualifier at: ...{context_with_marker}...")
-                    position += len(qualifier)
-        elif not in_quote and test_string[position:position+len(delimiter)] == delimiter:
-            print(f"Position {position}: Found delimiter outside quotes: ...{context_with_marker}...")
-            position += len(delimiter)
+                    trace.append(f"Position {position}: Found embedded qualifier at: ...{context_with_marker(position)}...")
+                    position += qualifier_length
         else:
-            if in_quote:
-                print(f"Position {position}: Regular character inside quotes: ...{context_with_marker}...")
-            else:
-                print(f"Position {position}: Regular character outside quotes: ...{context_with_marker}...")
-            position += 1
+            trace.append(f"Position {position}: Found delimiter outside quotes: ...{context_with_marker(position)}...")
+            position += delimiter_length
+    
+    print("\n".join(trace))
 
 # Do detailed tracing if needed
 print("\nDetailed tracing of the problematic cases:")
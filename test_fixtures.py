@@ -0,0 +1,7 @@
+# Example lines shared by the test scripts
+
+# A quoted field with an embedded quoted phrase ending right before the closing quote
+splash_case = '"1"|^|"ADB will apply SSL Certificates for WGU Complio "Splash pages""|^|"Paid"'
+
+# A quoted field ending in an inch mark right before the closing quote
+inches_case = '"2"|^|"CAP-GOWN PKG ULTRA NAVY 57""|^|"Paid"'
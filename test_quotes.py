@@ -5,8 +5,7 @@ delimiter = '|^|'
 qualifier = '"'
 
 # Test cases
-splash_case = '"1"|^|"ADB will apply SSL Certificates for WGU Complio "Splash pages""|^|"Paid"'
-inches_case = '"2"|^|"CAP-GOWN PKG ULTRA NAVY 57""|^|"Paid"'
+from test_fixtures import splash_case, inches_case
 
 # Execute tests
 print("Testing embedded quotes handling:")
@@ -22,18 +21,21 @@ import os
 from pathlib import Path
 from data_shifting import fix_data_shifting
 
+# Keep the temporary files in memory (tmpfs) where available
+TMPDIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
 try:
     # Create a temporary test file with our examples
-    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as test_file:
-        # Write a simplified header and our example lines
-        test_file.write('ID|^|Description|^|Status\n')
-        test_file.write(splash_case + '\n')
-        test_file.write(inches_case + '\n')
-        test_file_path = test_file.name
+    fd, test_file_path = tempfile.mkstemp(suffix='.txt', dir=TMPDIR)
+    try:
+        # Write a simplified header and our example lines in a single call
+        os.write(fd, ('ID|^|Description|^|Status\n' + splash_case + '\n' + inches_case + '\n').encode('utf-8'))
+    finally:
+        os.close(fd)
         
     print("\nCreated test file with example data")
     
-    # Create a temporary output file
+    # Create a temporary output file next to it
     output_file_path = test_file_path + '_corrected.txt'
     
     # Process the file
@@ -45,21 +47,24 @@ try:
         qualifier=qualifier
     )
     
-    # Check if the output file was created and read its contents
-    if os.path.exists(output_file_path):
-        with open(output_file_path, 'r') as output_file:
-            output_content = output_file.read()
-        
+    # Read the output file, if it was created
+    try:
+        output_content = Path(output_file_path).read_text(encoding='utf-8')
+    except FileNotFoundError:
+        output_content = None
+    
+    if output_content is not None:
         print("\nOutput file contents:")
         print(output_content)
         
-        # Check if all lines are present in the output
-        lines_count = output_content.count('\n') + 1
+        # Check if all lines are present in the output (a trailing newline
+        # does not start another line)
+        lines_count = output_content.count('\n') + (0 if output_content.endswith('\n') else 1)
         print(f"\nOutput file has {lines_count} lines (Expected: 3)")
         
         # Clean up temporary files
-        os.remove(test_file_path)
-        os.remove(output_file_path)
+        Path(test_file_path).unlink(missing_ok=True)
+        Path(output_file_path).unlink(missing_ok=True)
     else:
         print("\nWarning: Output file was not created")
 